@@ -0,0 +1,244 @@
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Optional
+
+# Ring sizes - memory per guild stays fixed no matter how long the bot runs
+MINUTE_SLOTS = 1440  # 24 hours of minute buckets
+HOUR_SLOTS = 720  # 30 days of hour buckets
+CURVE_POINTS = 48  # Buckets per giveaway entry curve
+MAX_CURVES = 10  # Giveaway curves kept per guild
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+_MAGIC = b"SBA1"
+_HEADER = struct.Struct("<4sI")
+_GUILD = struct.Struct("<QH")
+_RING = struct.Struct("<qII")
+_CURVE = struct.Struct("<QddH")
+
+
+def _to_le(arr):
+    """Return array bytes in little-endian order"""
+    if sys.byteorder == "little":
+        return arr.tobytes()
+    swapped = array(arr.typecode, arr)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _from_le(typecode, data):
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+class RingBuffer:
+    """Fixed-size time series of role adds/removes and supporter counts.
+
+    Each slot covers `width` seconds. `head` is the absolute bucket index
+    (timestamp // width) of the newest slot; older slots are overwritten as
+    time moves forward.
+    """
+
+    __slots__ = ("width", "size", "head", "added", "removed", "gauge")
+
+    def __init__(self, width: int, size: int):
+        self.width = width
+        self.size = size
+        self.head = -1
+        self.added = array("I", [0]) * size
+        self.removed = array("I", [0]) * size
+        self.gauge = array("i", [-1]) * size  # -1 = no sweep in this bucket
+
+    def _clear(self, slot):
+        self.added[slot] = 0
+        self.removed[slot] = 0
+        self.gauge[slot] = -1
+
+    def advance(self, ts: float):
+        """Move the head up to `ts`, clearing skipped slots. Returns the slot for `ts`, or None if too old"""
+        index = int(ts // self.width)
+        if self.head < 0:
+            self.head = index
+        elif index > self.head:
+            for i in range(1, min(index - self.head, self.size) + 1):
+                self._clear((self.head + i) % self.size)
+            self.head = index
+        elif index <= self.head - self.size:
+            return None
+        return index % self.size
+
+    def record(self, ts: float, added: int = 0, removed: int = 0, gauge: Optional[int] = None):
+        slot = self.advance(ts)
+        if slot is None:
+            return
+        self.added[slot] += added
+        self.removed[slot] += removed
+        if gauge is not None:
+            self.gauge[slot] = gauge
+
+    def series(self, now: float, count: int):
+        """Return (added, removed, gauge) lists for the last `count` buckets, oldest first"""
+        self.advance(now)
+        count = min(count, self.size)
+        slots = [(self.head - count + 1 + i) % self.size for i in range(count)]
+        return (
+            [self.added[s] for s in slots],
+            [self.removed[s] for s in slots],
+            [self.gauge[s] for s in slots],
+        )
+
+    def to_bytes(self):
+        return (
+            _RING.pack(self.head, self.width, self.size)
+            + _to_le(self.added)
+            + _to_le(self.removed)
+            + _to_le(self.gauge)
+        )
+
+    @classmethod
+    def from_bytes(cls, data, offset):
+        head, width, size = _RING.unpack_from(data, offset)
+        offset += _RING.size
+        ring = cls(width, size)
+        ring.head = head
+        chunk = size * 4
+        ring.added = _from_le("I", data[offset:offset + chunk])
+        ring.removed = _from_le("I", data[offset + chunk:offset + 2 * chunk])
+        ring.gauge = _from_le("i", data[offset + 2 * chunk:offset + 3 * chunk])
+        return ring, offset + 3 * chunk
+
+
+class EntryCurve:
+    """Giveaway entries bucketed over the giveaway's lifetime"""
+
+    __slots__ = ("giveaway_id", "start", "width", "counts")
+
+    def __init__(self, giveaway_id: int, start: float, width: float):
+        self.giveaway_id = giveaway_id
+        self.start = start
+        self.width = width
+        self.counts = array("I", [0]) * CURVE_POINTS
+
+    def record(self, ts: float):
+        slot = int((ts - self.start) // self.width)
+        self.counts[max(0, min(slot, CURVE_POINTS - 1))] += 1
+
+    def to_bytes(self):
+        return _CURVE.pack(self.giveaway_id, self.start, self.width, len(self.counts)) + _to_le(self.counts)
+
+    @classmethod
+    def from_bytes(cls, data, offset):
+        giveaway_id, start, width, points = _CURVE.unpack_from(data, offset)
+        offset += _CURVE.size
+        curve = cls(giveaway_id, start, width)
+        curve.counts = _from_le("I", data[offset:offset + points * 4])
+        return curve, offset + points * 4
+
+
+class GuildStats:
+    __slots__ = ("minutes", "hours", "curves")
+
+    def __init__(self):
+        self.minutes = RingBuffer(60, MINUTE_SLOTS)
+        self.hours = RingBuffer(3600, HOUR_SLOTS)
+        self.curves = {}  # giveaway_id -> EntryCurve, oldest first
+
+    def record(self, ts: float, added: int = 0, removed: int = 0, gauge: Optional[int] = None):
+        self.minutes.record(ts, added, removed, gauge)
+        self.hours.record(ts, added, removed, gauge)
+
+
+class AnalyticsStore:
+    """Per-guild supporter analytics, persisted as a compact binary file"""
+
+    def __init__(self):
+        self.guilds = {}
+
+    def _guild(self, guild_id: int):
+        stats = self.guilds.get(guild_id)
+        if stats is None:
+            stats = self.guilds[guild_id] = GuildStats()
+        return stats
+
+    def get(self, guild_id: int):
+        return self.guilds.get(guild_id)
+
+    def record_change(self, guild_id: int, added: int = 0, removed: int = 0, ts: Optional[float] = None):
+        self._guild(guild_id).record(time.time() if ts is None else ts, added, removed)
+
+    def record_gauge(self, guild_id: int, supporters: int, ts: Optional[float] = None):
+        self._guild(guild_id).record(time.time() if ts is None else ts, gauge=supporters)
+
+    def start_giveaway(self, guild_id: int, giveaway_id: int, start: float, end: float):
+        curves = self._guild(guild_id).curves
+        while len(curves) >= MAX_CURVES:
+            del curves[next(iter(curves))]
+        width = max(end - start, 1) / CURVE_POINTS
+        curves[giveaway_id] = EntryCurve(giveaway_id, start, width)
+
+    def record_entry(self, guild_id: int, giveaway_id: int, ts: Optional[float] = None):
+        stats = self.guilds.get(guild_id)
+        if stats is None or giveaway_id not in stats.curves:
+            return
+        stats.curves[giveaway_id].record(time.time() if ts is None else ts)
+
+    def to_bytes(self):
+        parts = [_HEADER.pack(_MAGIC, len(self.guilds))]
+        for guild_id, stats in self.guilds.items():
+            parts.append(_GUILD.pack(guild_id, len(stats.curves)))
+            parts.append(stats.minutes.to_bytes())
+            parts.append(stats.hours.to_bytes())
+            parts.extend(curve.to_bytes() for curve in stats.curves.values())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        store = cls()
+        magic, guild_count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("not an analytics file")
+        offset = _HEADER.size
+        for _ in range(guild_count):
+            guild_id, curve_count = _GUILD.unpack_from(data, offset)
+            offset += _GUILD.size
+            stats = GuildStats()
+            stats.minutes, offset = RingBuffer.from_bytes(data, offset)
+            stats.hours, offset = RingBuffer.from_bytes(data, offset)
+            for _ in range(curve_count):
+                curve, offset = EntryCurve.from_bytes(data, offset)
+                stats.curves[curve.giveaway_id] = curve
+            store.guilds[guild_id] = stats
+        return store
+
+    def save(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str):
+        try:
+            with open(path, "rb") as f:
+                return cls.from_bytes(f.read())
+        except FileNotFoundError:
+            return cls()
+
+
+def sparkline(values, missing: Optional[int] = None):
+    """Render values as a block-character sparkline; `missing` values become spaces"""
+    known = [v for v in values if v != missing]
+    if not known:
+        return ""
+    low, high = min(known), max(known)
+    span = (high - low) or 1
+    return "".join(
+        " " if v == missing else SPARK_CHARS[(v - low) * (len(SPARK_CHARS) - 1) // span]
+        for v in values
+    )
@@ -1,17 +1,19 @@
-from flask import Flask
 from threading import Thread
 
-app = Flask('')
-
-@app.route('/')
-def home():
-    return "Discord bot is running! ✅"
-
-@app.route('/status')
-def status():
-    return {"status": "online", "message": "Bot is active"}
-
 def run():
+    # Flask is imported here so it loads on the web server thread, off the bot's startup path
+    from flask import Flask
+    
+    app = Flask('')
+    
+    @app.route('/')
+    def home():
+        return "Discord bot is running! ✅"
+    
+    @app.route('/status')
+    def status():
+        return {"status": "online", "message": "Bot is active"}
+    
     app.run(host='0.0.0.0', port=8080)
 
 def keep_alive():
@@ -1,6 +1,10 @@
+import time
+STARTUP_START = time.perf_counter()  # Taken before any other import so the import phase is measured
+
 import discord
 from discord.ext import commands, tasks
 import json
+import marshal
 import random
 import asyncio
 from datetime import datetime, timedelta, timezone
@@ -8,6 +12,7 @@ from typing import Optional
 import os
 from dotenv import load_dotenv
 from keep_alive import keep_alive
+from analytics import AnalyticsStore, sparkline
 
 # Load environment variables
 load_dotenv()
@@ -26,36 +31,158 @@ CONFIG = {
 # Data storage
 giveaways = {}
 status_tracker = {}
+analytics = AnalyticsStore()
+DATA_FILE = 'bot_data.json'
+SNAPSHOT_FILE = 'bot_state.snap'
+SNAPSHOT_VERSION = 1
+ANALYTICS_FILE = 'bot_analytics.bin'
+history_loaded = False
+history_task = None
 
-# Load data from file
-def load_data():
-    global giveaways, status_tracker
+# Startup timings
+startup_phases = {}
+last_phase_mark = STARTUP_START
+ready_once = False
+
+# Record how long a startup phase took (only the first time it completes)
+def mark_phase(name):
+    global last_phase_mark
+    if name in startup_phases:
+        return
+    now = time.perf_counter()
+    startup_phases[name] = now - last_phase_mark
+    last_phase_mark = now
+
+def format_startup():
+    total = sum(startup_phases.values())
+    phases = " · ".join(f"{name} {seconds:.2f}s" for name, seconds in startup_phases.items())
+    return f"{total:.2f}s ({phases})"
+
+# Read the full giveaway history (JSON)
+def read_history():
     try:
-        with open('bot_data.json', 'r') as f:
-            data = json.load(f)
-            giveaways = data.get('giveaways', {})
-            status_tracker = data.get('status_tracker', {})
-            print(f"✅ Loaded {len(giveaways)} giveaways from storage")
+        with open(DATA_FILE, 'r') as f:
+            return json.load(f)
     except FileNotFoundError:
-        giveaways = {}
-        status_tracker = {}
         print("📝 No existing data found, starting fresh")
+        return {}
+
+# Merge the full history under the active state already in memory
+def merge_history(data):
+    global history_loaded
+    if history_loaded:
+        return
+    for giveaway_id, giveaway in data.get('giveaways', {}).items():
+        giveaways.setdefault(giveaway_id, giveaway)
+    for key, value in data.get('status_tracker', {}).items():
+        status_tracker.setdefault(key, value)
+    history_loaded = True
+    print(f"✅ Loaded {len(giveaways)} giveaways from storage")
+
+# Load the full history now if the background load hasn't finished yet
+def ensure_history():
+    if not history_loaded:
+        merge_history(read_history())
+
+async def load_history_async():
+    merge_history(await asyncio.to_thread(read_history))
+
+# Load the active-state snapshot; returns False if it's missing or unreadable
+def load_snapshot():
+    global giveaways, status_tracker
+    try:
+        with open(SNAPSHOT_FILE, 'rb') as f:
+            data = marshal.load(f)
+    except FileNotFoundError:
+        return False
+    except (EOFError, ValueError, TypeError) as e:
+        # marshal's format is tied to the Python version, so a stale snapshot is expected after upgrades
+        print(f"⚠️ Ignoring unreadable snapshot: {e}")
+        return False
+    
+    if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION:
+        return False
+    
+    giveaways = data['giveaways']
+    status_tracker = data['status_tracker']
+    print(f"⚡ Loaded {len(giveaways)} active giveaways from snapshot")
+    return True
+
+# Write active giveaways and the status tracker to the snapshot file
+def save_snapshot():
+    tmp = SNAPSHOT_FILE + '.tmp'
+    with open(tmp, 'wb') as f:
+        marshal.dump({
+            'version': SNAPSHOT_VERSION,
+            'giveaways': {gid: g for gid, g in giveaways.items() if not g["ended"]},
+            'status_tracker': status_tracker
+        }, f)
+    os.replace(tmp, SNAPSHOT_FILE)
+
+# Load active state before connecting; the full history follows in the background
+def load_data():
+    global analytics
+    if not load_snapshot():
+        merge_history(read_history())
+    
+    try:
+        analytics = AnalyticsStore.load(ANALYTICS_FILE)
+    except Exception as e:
+        analytics = AnalyticsStore()
+        print(f"❌ Error loading analytics, starting fresh: {e}")
 
 # Save data to file
 def save_data():
-    with open('bot_data.json', 'w') as f:
+    ensure_history()
+    with open(DATA_FILE, 'w') as f:
         json.dump({
             'giveaways': giveaways,
             'status_tracker': status_tracker
         }, f, indent=4)
+    save_snapshot()
+
+# Save analytics ring buffers to their binary file
+def save_analytics():
+    try:
+        analytics.save(ANALYTICS_FILE)
+    except Exception as e:
+        print(f"❌ Error saving analytics: {e}")
 
 # Check if user has the required role
 def has_status_role(member):
     role = discord.utils.get(member.guild.roles, name=CONFIG["status_role_name"])
     return role in member.roles if role else False
 
+# Runs once after login, before the gateway connects
+async def setup_hook():
+    global history_task
+    mark_phase("login")
+    if not history_loaded:
+        history_task = asyncio.create_task(load_history_async())
+    check_statuses.start()
+    flush_analytics.start()
+
+bot.setup_hook = setup_hook
+
 @bot.event
 async def on_ready():
+    global ready_once
+    
+    # Set bot status (presence is reset on reconnect)
+    await bot.change_presence(
+        activity=discord.Activity(
+            type=discord.ActivityType.watching,
+            name=f"for {CONFIG['tracked_status']} | !help"
+        )
+    )
+    
+    # on_ready fires again after every reconnect - only report the first one
+    if ready_once:
+        print(f"🔄 Reconnected as {bot.user}")
+        return
+    ready_once = True
+    mark_phase("chunking")
+    
     print(f'━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
     print(f'✅ Bot logged in as {bot.user}')
     print(f'🆔 Bot ID: {bot.user.id}')
@@ -64,17 +191,6 @@ async def on_ready():
     print(f'👥 Status role: "{CONFIG["status_role_name"]}"')
     print(f'⏱️  Check interval: {CONFIG["check_interval"]}s')
     print(f'━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
-    
-    load_data()
-    check_statuses.start()
-    
-    # Set bot status
-    await bot.change_presence(
-        activity=discord.Activity(
-            type=discord.ActivityType.watching,
-            name=f"for {CONFIG['tracked_status']} | !help"
-        )
-    )
 
 @bot.event
 async def on_raw_reaction_add(payload):
@@ -106,7 +222,9 @@ async def on_raw_reaction_add(payload):
         return
     
     # Check if member has the required role
-    if not has_status_role(member):
+    if has_status_role(member):
+        analytics.record_entry(guild.id, payload.message_id)
+    else:
         # Remove the reaction
         try:
             channel = bot.get_channel(payload.channel_id)
@@ -140,6 +258,7 @@ async def check_statuses():
         if not role:
             continue
         
+        supporters = 0
         for member in guild.members:
             if member.bot:
                 continue
@@ -175,10 +294,14 @@ async def check_statuses():
                             has_correct_status = True
                             break
             
+            if has_correct_status:
+                supporters += 1
+            
             # Assign or remove role based on status
             if has_correct_status and role not in member.roles:
                 try:
                     await member.add_roles(role)
+                    analytics.record_change(guild.id, added=1)
                     print(f"✅ Added {CONFIG['status_role_name']} to {member.name}")
                 except discord.Forbidden:
                     print(f"❌ Missing permissions to add role to {member.name}")
@@ -187,16 +310,28 @@ async def check_statuses():
             elif not has_correct_status and role in member.roles:
                 try:
                     await member.remove_roles(role)
+                    analytics.record_change(guild.id, removed=1)
                     print(f"🔻 Removed {CONFIG['status_role_name']} from {member.name}")
                 except discord.Forbidden:
                     print(f"❌ Missing permissions to remove role from {member.name}")
                 except Exception as e:
                     print(f"❌ Error removing role from {member.name}: {e}")
+        
+        analytics.record_gauge(guild.id, supporters)
+    
+    if "first sweep" not in startup_phases:
+        mark_phase("first sweep")
+        print(f"🚀 Ready in {format_startup()}")
 
 @check_statuses.before_loop
 async def before_check_statuses():
     await bot.wait_until_ready()
 
+@tasks.loop(minutes=1)
+async def flush_analytics():
+    """Persist supporter analytics once a minute"""
+    save_analytics()
+
 @bot.command(name='setstatus')
 @commands.has_permissions(administrator=True)
 async def set_status(ctx, *, status_text: str):
@@ -361,6 +496,7 @@ async def start_giveaway(ctx, duration: str, winners: int, *, prize: str):
         "ended": False
     }
     save_data()
+    analytics.start_giveaway(ctx.guild.id, giveaway_msg.id, end_time.timestamp() - seconds, end_time.timestamp())
     
     # Schedule end
     await asyncio.sleep(seconds)
@@ -457,6 +593,7 @@ async def reroll_giveaway(ctx, message_id: int):
     Example: !reroll 123456789
     """
     giveaway_id = str(message_id)
+    ensure_history()
     
     if giveaway_id not in giveaways:
         await ctx.send("❌ Giveaway not found!")
@@ -554,10 +691,77 @@ async def show_config(ctx):
         inline=True
     )
     
+    if "first sweep" in startup_phases:
+        embed.add_field(name="🚀 Time to Ready", value=format_startup(), inline=False)
+    
     embed.set_footer(text=f"Bot latency: {round(bot.latency * 1000)}ms")
     
     await ctx.send(embed=embed)
 
+# Render one ring buffer window as an embed field value
+def format_trend(added, removed, gauge):
+    known = [g for g in gauge if g >= 0]
+    if not known:
+        return "No data yet"
+    return (
+        f"`{sparkline(gauge, missing=-1)}`\n"
+        f"Now: **{known[-1]}** · Min: {min(known)} · Max: {max(known)}\n"
+        f"Role changes: +{sum(added)} / -{sum(removed)}"
+    )
+
+# Render a giveaway entry curve as an embed field value
+def format_curve(curve):
+    return f"`{sparkline(list(curve.counts))}`\nEntries: **{sum(curve.counts)}**"
+
+@bot.command(name='stats')
+@commands.has_permissions(administrator=True)
+async def show_stats(ctx, message_id: Optional[int] = None):
+    """Show supporter trends and giveaway entry curves (Admin only)
+    Example: !stats
+    Example: !stats 123456789
+    """
+    stats = analytics.get(ctx.guild.id)
+    if not stats:
+        await ctx.send("📭 No analytics recorded yet!")
+        return
+
+    if message_id is not None:
+        curve = stats.curves.get(message_id)
+        if not curve:
+            await ctx.send("❌ No entry curve found for that giveaway!")
+            return
+
+        giveaway = giveaways.get(str(message_id), {})
+        embed = discord.Embed(
+            title=f"📈 Entries - {giveaway.get('prize', message_id)}",
+            description=format_curve(curve),
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"Each bar is {round(curve.width / 60, 1)} minutes")
+        await ctx.send(embed=embed)
+        return
+
+    now = datetime.now(timezone.utc).timestamp()
+
+    embed = discord.Embed(
+        title="📈 Supporter Analytics",
+        color=discord.Color.blue()
+    )
+    embed.add_field(name="🕐 Last 60 Minutes", value=format_trend(*stats.minutes.series(now, 60)), inline=False)
+    embed.add_field(name="📅 Last 48 Hours", value=format_trend(*stats.hours.series(now, 48)), inline=False)
+
+    for curve in list(stats.curves.values())[-5:][::-1]:  # Newest 5
+        giveaway = giveaways.get(str(curve.giveaway_id), {})
+        embed.add_field(
+            name=f"🎁 {giveaway.get('prize', curve.giveaway_id)}",
+            value=format_curve(curve),
+            inline=False
+        )
+
+    embed.set_footer(text="Use !stats <msg_id> for a single giveaway")
+
+    await ctx.send(embed=embed)
+
 @bot.command(name='help', aliases=['h', 'commands'])
 async def help_command(ctx):
     """Show all commands"""
@@ -592,6 +796,7 @@ async def help_command(ctx):
         name="ℹ️ Information",
         value=(
             "`!config` - View bot configuration\n"
+            "`!stats [msg_id]` - Supporter trends & entry curves (Admin)\n"
             "`!glist` - List active giveaways\n"
             "`!help` - Show this message"
         ),
@@ -631,6 +836,7 @@ async def on_command_error(ctx, error):
 
 # Run the bot
 if __name__ == "__main__":
+    mark_phase("import")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
     print("🚀 Starting Discord Status Bot...")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -644,6 +850,10 @@ if __name__ == "__main__":
         print("   Or edit this file and replace TOKEN")
         exit(1)
     
+    # Load active state before the gateway connects
+    load_data()
+    mark_phase("load")
+    
     # Start keep_alive web server
     keep_alive()
     